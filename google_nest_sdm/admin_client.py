@@ -38,13 +38,13 @@ SDM_MANAGED_TOPIC_FORMAT = (
 )
 
 # Used to catch invalid subscriber id
-EXPECTED_SUBSCRIBER_REGEXP = re.compile("^projects/[^/]+/subscriptions/[^/]+$")
+EXPECTED_SUBSCRIBER_REGEXP = re.compile("projects/[^/]+/subscriptions/[^/]+")
 
 # Used to catch a topic misconfiguration
-EXPECTED_TOPIC_REGEXP = re.compile("^projects/[^/]+/topics/[^/]+$")
+EXPECTED_TOPIC_REGEXP = re.compile("projects/[^/]+/topics/[^/]+")
 
 # Topic prefix for the project
-EXPECTED_PROJECS_PREFIX = re.compile("^projects/[^/]+$")
+EXPECTED_PROJECS_PREFIX = re.compile("projects/[^/]+")
 
 
 @dataclass
@@ -78,7 +78,7 @@ def validate_subscription_name(subscription_name: str) -> None:
 
     Raises ConfigurationException on failure.
     """
-    if not EXPECTED_SUBSCRIBER_REGEXP.match(subscription_name):
+    if not EXPECTED_SUBSCRIBER_REGEXP.fullmatch(subscription_name):
         DIAGNOSTICS.increment("subscription_name_invalid")
         _LOGGER.debug("Subscription name did not match pattern: %s", subscription_name)
         raise ConfigurationException(
@@ -93,7 +93,7 @@ def validate_topic_name(topic_name: str) -> None:
 
     Raises ConfigurationException on failure.
     """
-    if not EXPECTED_TOPIC_REGEXP.match(topic_name):
+    if not EXPECTED_TOPIC_REGEXP.fullmatch(topic_name):
         DIAGNOSTICS.increment("topic_name_invalid")
         _LOGGER.debug("Topic name did not match pattern: %s", topic_name)
         raise ConfigurationException(
@@ -108,7 +108,7 @@ def validate_projects_prefix(project_path: str) -> None:
 
     Raises ConfigurationException on failure.
     """
-    if not EXPECTED_PROJECS_PREFIX.match(project_path):
+    if not EXPECTED_PROJECS_PREFIX.fullmatch(project_path):
         DIAGNOSTICS.increment("topic_prefix_invalid")
         _LOGGER.debug("Topic prefix did not match pattern: %s", project_path)
         raise ConfigurationException(
@@ -43,6 +43,16 @@ ERROR = "error"
 STATUS = "status"
 MESSAGE = "message"
 
+OAUTH2_AUTHORIZE_FORMAT = (
+    "https://nestservices.google.com/partnerconnections/{project_id}/auth"
+)
+OAUTH2_TOKEN = "https://www.googleapis.com/oauth2/v4/token"
+SDM_SCOPES = [
+    "https://www.googleapis.com/auth/sdm.service",
+    "https://www.googleapis.com/auth/pubsub",
+]
+API_URL = "https://smartdevicemanagement.googleapis.com/v1"
+
 
 @dataclass
 class Status(DataClassJSONMixin):
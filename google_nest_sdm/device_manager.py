@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Awaitable, Callable, Dict
 
 from .device import Device, ParentRelation
@@ -61,6 +62,19 @@ class DeviceManager:
         for device in self._devices.values():
             device.event_media_manager.set_update_callback(target)
 
+    async def async_flush_media(self) -> None:
+        """Wait for media writes still in progress for all devices.
+
+        Media is written in the background after event callbacks are invoked,
+        so this should be called before shutdown to avoid losing media.
+        """
+        await asyncio.gather(
+            *(
+                device.event_media_manager.async_flush_media()
+                for device in self._devices.values()
+            )
+        )
+
     async def async_handle_event(self, event_message: EventMessage) -> None:
         """Handle a new message received."""
         if event_message.relation_update:
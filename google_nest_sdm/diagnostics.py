@@ -23,7 +23,7 @@ class Diagnostics:
 
     def increment(self, key: str, count: int = 1) -> None:
         """Increment a counter for the specified key/event."""
-        self._counter.update(Counter({key: count}))
+        self._counter[key] += count
 
     def elapsed(self, key_prefix: str, elapsed_ms: int = 1) -> None:
         """Track a latency event for the specified key/event prefix."""
@@ -185,7 +185,13 @@ class ImageEventBase(DataClassDictMixin, ABC):
     @property
     def is_expired(self) -> bool:
         """Return true if the event expiration has passed."""
-        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        return self.is_expired_at(datetime.datetime.now(tz=datetime.timezone.utc))
+
+    def is_expired_at(self, now: datetime.datetime) -> bool:
+        """Return true if the event expiration has passed relative to `now`.
+
+        Callers checking many events can read the clock once and reuse it.
+        """
         return self.expires_at < now
 
     def as_dict(self) -> dict[str, Any]:
@@ -365,7 +371,7 @@ class UpdateEventsSerializationStrategy(SerializationStrategy, use_annotations=T
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class EventMessage(DataClassDictMixin):
     """Event for a change in trait value or device action."""
 
@@ -12,7 +12,7 @@ from __future__ import annotations
 
 import asyncio
 import datetime
-import itertools
+import functools
 import logging
 import time
 from abc import ABC, abstractmethod
@@ -74,6 +74,9 @@ VISIBLE_EVENTS = [
 # Percentage of items to delete when bulk purging from the cache
 EXPIRE_CACHE_BATCH_SIZE = 0.05
 
+# Number of media writes allowed in flight before new writes wait
+MAX_PENDING_MEDIA_WRITES = 8
+
 
 @dataclass
 class Media:
@@ -329,6 +332,13 @@ class EventMediaModelItem(DataClassDictMixin):
         }
 
 
+def _session_timestamp(
+    x: ImageEventBase | ImageSession | ClipPreviewSession,
+) -> datetime.datetime:
+    """Sort key for events and sessions by timestamp."""
+    return x.timestamp
+
+
 class EventMediaManager:
     """Responsible for handling recent events and fetching associated media."""
 
@@ -351,6 +361,7 @@ class EventMediaManager:
         )
         self._diagnostics = diagnostics
         self._lock: asyncio.Lock | None = None
+        self._pending_writes: dict[str, asyncio.Task[None]] = {}
 
     @property
     def cache_policy(self) -> CachePolicy:
@@ -362,6 +373,47 @@ class EventMediaManager:
         """Update the CachePolicy."""
         self._cache_policy = value
 
+    async def async_flush_media(self) -> None:
+        """Wait for any media writes still in progress to complete.
+
+        Owners should call this (or `DeviceManager.async_flush_media`) before
+        shutting down, otherwise queued media writes may be lost.
+        """
+        if self._pending_writes:
+            await asyncio.wait(list(self._pending_writes.values()))
+
+    async def _async_save_media(self, media_key: str, content: bytes) -> None:
+        """Write media content to the store in the background.
+
+        Reads, removals, and transcodes of the same media key wait for the
+        write to finish, so callers may be notified before the write completes.
+        A failed write is logged and counted as `save_media.error`; the media
+        key stays assigned to the event, so reading it returns no media.
+        """
+        if len(self._pending_writes) >= MAX_PENDING_MEDIA_WRITES:
+            await asyncio.wait(
+                list(self._pending_writes.values()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        task = asyncio.create_task(
+            self._cache_policy.store.async_save_media(media_key, content)
+        )
+        self._pending_writes[media_key] = task
+        task.add_done_callback(functools.partial(self._on_media_saved, media_key))
+
+    def _on_media_saved(self, media_key: str, task: asyncio.Task[None]) -> None:
+        """Clean up after a background media write completes."""
+        if self._pending_writes.get(media_key) is task:
+            del self._pending_writes[media_key]
+        if not task.cancelled() and (err := task.exception()):
+            self._diagnostics.increment("save_media.error")
+            _LOGGER.warning("Failure when saving media %s: %s", media_key, err)
+
+    async def _async_wait_for_media(self, media_key: str) -> None:
+        """Wait for a pending write of the media key, if any."""
+        if task := self._pending_writes.get(media_key):
+            await asyncio.wait([task])
+
     async def _async_load(self) -> OrderedDict[str, EventMediaModelItem]:
         """Load the device specific data from the store."""
         store_data = await self._cache_policy.store.async_load()
@@ -372,7 +424,7 @@ class EventMediaManager:
                 try:
                     item = EventMediaModelItem.from_dict(item_data)
                 except Exception as err:
-                    _LOGGER.debug("Failed to parse event item: %s", str(err))
+                    _LOGGER.debug("Failed to parse event item: %s", err)
                     raise err
                 event_data[item.event_session_id] = item
         return event_data
@@ -385,11 +437,12 @@ class EventMediaManager:
             device_data.append(item.to_dict())
 
         # Read data from the store and update information for this device
-        store_data = await self._cache_policy.store.async_load()
+        store = self._cache_policy.store
+        store_data = await store.async_load()
         if not store_data:
             store_data = {}
         store_data[self._device_id] = device_data
-        await self._cache_policy.store.async_save(store_data)
+        await store.async_save(store_data)
 
     async def _async_load_item(
         self, event_session_id: str
@@ -420,6 +473,7 @@ class EventMediaManager:
                 "Expiring cache %s", self._cache_policy.event_cache_expire_count
             )
             # Bulk pop items
+            store = self._cache_policy.store
             for i in range(0, self._cache_policy.event_cache_expire_count):
                 (key, old_item) = event_data.popitem(last=False)
                 _LOGGER.debug(
@@ -428,7 +482,8 @@ class EventMediaManager:
                     old_item.event_session_id,
                 )
                 for media_key in old_item.all_media_keys:
-                    await self._cache_policy.store.async_remove_media(media_key)
+                    await self._async_wait_for_media(media_key)
+                    await store.async_remove_media(media_key)
             await self._async_update(event_data)
 
     async def _fetch_media(self, item: EventMediaModelItem) -> None:
@@ -464,7 +519,7 @@ class EventMediaManager:
                 item.media_key = media_key
                 _LOGGER.debug("Saving media %s (%s)", media_key, item.event_session_id)
                 self._diagnostics.increment("fetch_clip.save")
-                await store.async_save_media(media_key, content)
+                await self._async_save_media(media_key, content)
                 return
 
         if CameraEventImageTrait.NAME not in self._traits:
@@ -474,8 +529,9 @@ class EventMediaManager:
         event_image_trait: CameraEventImageTrait = self._traits[
             CameraEventImageTrait.NAME
         ]
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
         for event in item.events.values():
-            if event.event_id in item.event_media_keys or event.is_expired:
+            if event.event_id in item.event_media_keys or event.is_expired_at(now):
                 self._diagnostics.increment("fetch_image.skip")
                 continue
             event_image = await event_image_trait.generate_image(event.event_id)
@@ -486,7 +542,7 @@ class EventMediaManager:
             item.event_media_keys[event.event_id] = media_key
             _LOGGER.debug("Saving media %s (%s)", media_key, item.event_session_id)
             self._diagnostics.increment("fetch_image.save")
-            await store.async_save_media(media_key, content)
+            await self._async_save_media(media_key, content)
 
     async def get_media_from_token(self, event_token: str) -> Media | None:
         """Get media based on the event token."""
@@ -502,6 +558,7 @@ class EventMediaManager:
             self._diagnostics.increment("get_media.no_media")
             _LOGGER.debug("No persisted media for event id %s", token)
             return None
+        await self._async_wait_for_media(media_key)
         contents = await self._cache_policy.store.async_load_media(media_key)
         if not contents:
             self._diagnostics.increment("get_media.empty")
@@ -519,6 +576,7 @@ class EventMediaManager:
     async def get_clip_thumbnail_from_token(self, event_token: str) -> Media | None:
         """Get a thumbnail from the event token."""
         self._diagnostics.increment("get_clip")
+        store = self._cache_policy.store
         token = EventToken.decode(event_token)
         if (
             not (item := await self._async_load_item(token.event_session_id))
@@ -532,9 +590,8 @@ class EventMediaManager:
 
         if item.thumbnail_media_key:
             # Load cached thumbnail
-            contents = await self._cache_policy.store.async_load_media(
-                item.thumbnail_media_key
-            )
+            await self._async_wait_for_media(item.thumbnail_media_key)
+            contents = await store.async_load_media(item.thumbnail_media_key)
             if contents:
                 self._diagnostics.increment("get_clip.cached")
                 return Media(contents, EventImageType.IMAGE_PREVIEW)
@@ -549,26 +606,25 @@ class EventMediaManager:
             _LOGGER.debug("No persisted media for event id %s", token)
             return None
 
-        thumbnail_media_key = (
-            self._cache_policy.store.get_clip_preview_thumbnail_media_key(
-                self._device_id, item.visible_event
-            )
+        thumbnail_media_key = store.get_clip_preview_thumbnail_media_key(
+            self._device_id, item.visible_event
         )
         if not self._cache_policy.transcoder or not thumbnail_media_key:
             self._diagnostics.increment("get_clip.no_transcoding")
             _LOGGER.debug("Clip transcoding disabled")
             return None
 
+        await self._async_wait_for_media(media_key)
         try:
             await self._cache_policy.transcoder.transcode_clip(
                 media_key, thumbnail_media_key
             )
         except TranscodeException as err:
             self._diagnostics.increment("get_clip.transcode_error")
-            _LOGGER.debug("Failure to transcode clip thumbnail: %s", str(err))
+            _LOGGER.debug("Failure to transcode clip thumbnail: %s", err)
             return None
 
-        contents = await self._cache_policy.store.async_load_media(thumbnail_media_key)
+        contents = await store.async_load_media(thumbnail_media_key)
         if not contents:
             self._diagnostics.increment("get_clip.load_error")
             _LOGGER.debug(
@@ -586,65 +642,46 @@ class EventMediaManager:
         """Return revent events."""
         self._diagnostics.increment("load_image_sessions")
 
-        def _get_events(x: EventMediaModelItem) -> list[ImageEventBase]:
-            # Only return events that have successful media fetches
-            return [
-                y
-                for y in x.events.values()
-                if x.media_key or y.event_id in x.event_media_keys
-            ]
-
         result = await self._items_with_media()
-        events_list = list(map(_get_events, result))
-        events: Iterable[ImageEventBase] = itertools.chain(*events_list)
-
-        def _get_session(x: ImageEventBase) -> ImageSession:
-            return ImageSession(x.event_token, x.timestamp, x.event_type)
-
-        event_result = list(map(_get_session, events))
-        event_result.sort(key=lambda x: x.timestamp, reverse=True)
+        # Only return events that have successful media fetches
+        event_result = [
+            ImageSession(y.event_token, y.timestamp, y.event_type)
+            for x in result
+            for y in x.events.values()
+            if x.media_key or y.event_id in x.event_media_keys
+        ]
+        event_result.sort(key=_session_timestamp, reverse=True)
         return event_result
 
     async def async_clip_preview_sessions(self) -> list[ClipPreviewSession]:
         """Return revent events for a device that supports clips."""
         self._diagnostics.increment("load_clip_previews")
 
-        def _event_visible(x: ImageEventBase) -> bool:
-            return x.event_type in VISIBLE_EVENTS
-
-        def _get_event_session(x: EventMediaModelItem) -> ClipPreviewSession | None:
+        result = await self._items_with_media()
+        valid_clips: list[ClipPreviewSession] = []
+        for x in result:
             assert x.visible_event
-            events = list(filter(_event_visible, x.events.values()))
-            events.sort(key=lambda x: x.timestamp)
+            events = [y for y in x.events.values() if y.event_type in VISIBLE_EVENTS]
+            events.sort(key=_session_timestamp)
             if not events:
                 _LOGGER.debug("Partial event in storage")
-                return None
+                continue
             visible_event = events[0]
-            return ClipPreviewSession(
-                visible_event.event_token,
-                visible_event.timestamp,
-                [y.event_type for y in events],
+            valid_clips.append(
+                ClipPreviewSession(
+                    visible_event.event_token,
+                    visible_event.timestamp,
+                    [y.event_type for y in events],
+                )
             )
-
-        result = await self._items_with_media()
-        clips: Iterable[ClipPreviewSession | None] = iter(
-            map(_get_event_session, result)
-        )
-        valid_clips: list[ClipPreviewSession] = [x for x in clips if x is not None]
-        valid_clips.sort(key=lambda x: x.timestamp, reverse=True)
+        valid_clips.sort(key=_session_timestamp, reverse=True)
         return valid_clips
 
     async def _items_with_media(self) -> list[EventMediaModelItem]:
         """Return items in the model that have media for serving."""
-
-        def _filter(x: EventMediaModelItem) -> bool:
-            """Return events already fetched or that could be fetched."""
-            if x.media_key or x.event_media_keys:
-                return True
-            return False
-
         event_data = await self._async_load()
-        return list(filter(_filter, event_data.values()))
+        # Return events already fetched or that could be fetched
+        return [x for x in event_data.values() if x.media_key or x.event_media_keys]
 
     def set_update_callback(
         self, target: Callable[[EventMessage], Awaitable[None]]
@@ -664,11 +701,12 @@ class EventMediaManager:
         recv_latency_ms = int((time.time() - event_message.timestamp.timestamp()) * 100)
 
         # Notify traits to cache most recent event
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
         pairs = list(event_sessions.items())
         for event_session_id, event_dict in pairs:
             supported = False
             for event_name, event in event_dict.items():
-                if not event.is_expired:
+                if not event.is_expired_at(now):
                     self._diagnostics.elapsed(event_name, recv_latency_ms)
                 else:
                     self._diagnostics.elapsed(f"{event_name}_expired", recv_latency_ms)
@@ -682,6 +720,10 @@ class EventMediaManager:
             if not supported:
                 del event_sessions[event_session_id]
 
+        if not event_sessions:
+            _LOGGER.debug("Message did not contain supported events")
+            return
+
         model_items = []
         failure = False
         for event_session_id, event_dict in event_sessions.items():
@@ -702,18 +744,25 @@ class EventMediaManager:
                 )
             model_items.append(model_item)
 
-            if self._support_fetch and self._cache_policy.fetch:
-                self._diagnostics.increment("event.fetch")
-                try:
-                    await self._fetch_media(model_item)
-                except GoogleNestException as err:
-                    self._diagnostics.increment("event.fetch_error")
-                    failure = True
-                    _LOGGER.warning(
-                        "Failure when pre-fetching event '%s': %s",
-                        event.event_session_id,
-                        str(err),
-                    )
+        if model_items and self._support_fetch and self._cache_policy.fetch:
+            # Pre-fetch media for all sessions concurrently
+            self._diagnostics.increment("event.fetch", len(model_items))
+            results = await asyncio.gather(
+                *(self._fetch_media(model_item) for model_item in model_items),
+                return_exceptions=True,
+            )
+            for model_item, result in zip(model_items, results):
+                if not isinstance(result, BaseException):
+                    continue
+                if not isinstance(result, GoogleNestException):
+                    raise result
+                self._diagnostics.increment("event.fetch_error")
+                failure = True
+                _LOGGER.warning(
+                    "Failure when pre-fetching event '%s': %s",
+                    model_item.event_session_id,
+                    result,
+                )
 
         # Send notifications for any undelivered events that have media.
         pending_events: dict[str, ImageEventBase] = {}
@@ -17,31 +17,29 @@ $ google_nest --project_id=<project_id> get <device_id>
 
 import argparse
 import asyncio
-import errno
 import json
 import logging
 import os
-import pickle
-from typing import cast
+import sys
+from typing import Any, Awaitable, Callable, cast
 
-import yaml
-from aiohttp import ClientSession
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
 from google.auth.credentials import Credentials
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.exceptions import RefreshError
+from google.oauth2.credentials import Credentials as UserCredentials
 
-from .auth import AbstractAuth
-from .camera_traits import CameraLiveStreamTrait
-from .device import Device
-from .event import EventMessage
-from .google_nest_api import GoogleNestAPI
-from .google_nest_subscriber import (
+from .auth import (
     API_URL,
     OAUTH2_AUTHORIZE_FORMAT,
     OAUTH2_TOKEN,
     SDM_SCOPES,
-    GoogleNestSubscriber,
+    AbstractAuth,
 )
+from .camera_traits import CameraLiveStreamTrait
+from .device import Device
+from .event import EventMessage
+from .exceptions import AuthException
+from .google_nest_api import CACHE_TTL_SECONDS, GoogleNestAPI
 from .structure import Structure
 from .thermostat_traits import (
     ThermostatEcoTrait,
@@ -49,77 +47,99 @@ from .thermostat_traits import (
     ThermostatTemperatureSetpointTrait,
 )
 
-# Define command line arguments
-parser = argparse.ArgumentParser(
-    description="Command line tool for Google Nest SDM API"
-)
-parser.add_argument("--project_id", required=True, help="Device Access program id")
-parser.add_argument("--client_id", help="OAuth credentials client_id")
-parser.add_argument("--client_secret", help="OAuth credentials client_secret")
-parser.add_argument(
-    "--token_cache",
-    help="File storage for long lived creds",
-    default="~/.config/google_nest/token_cache",
-)
-parser.add_argument(
-    "-v", "--verbose", help="Increase output verbosity", action="store_true"
-)
-parser.add_argument(
-    "--output_type",
-    type=str,
-    choices=["json", "yaml"],
-    help="Change the output type from json or yaml (default).",
-    default="yaml",
-)
-
-cmd_parser = parser.add_subparsers(dest="command", required=True)
-list_structures_parser = cmd_parser.add_parser("list_structures")
-list_devices_parser = cmd_parser.add_parser("list_devices")
-get_structure_parser = cmd_parser.add_parser("get_structure")
-get_structure_parser.add_argument("structure_id")
-get_device_parser = cmd_parser.add_parser("get_device")
-get_device_parser.add_argument("device_id")
-set_mode_parser = cmd_parser.add_parser(
-    "set_mode", description="Change the thermostat mode."
-)
-set_mode_parser.add_argument("device_id")
-set_mode_parser.add_argument(
-    "mode",
-    help="The mode to change the thermostat to.",
-    choices=["MANUAL_ECO", "HEAT", "COOL", "HEATCOOL", "OFF"],
-)
-set_heat_parser = cmd_parser.add_parser(
-    "set_heat", description="Sets the target temperature when in HEAT mode."
-)
-set_heat_parser.add_argument("device_id")
-set_heat_parser.add_argument("heat", type=float)
-set_cool_parser = cmd_parser.add_parser(
-    "set_cool", help="Sets the target temperature when in COOL mode."
-)
-set_cool_parser.add_argument("device_id")
-set_cool_parser.add_argument(
-    "cool",
-    type=float,
-    help="The target temperature to set when the thermostat is in COOL mode.",
-)
-set_range_parser = cmd_parser.add_parser(
-    "set_range", help="Sets the min/max temperature when in HEATCOOL mode."
-)
-set_range_parser.add_argument("device_id")
-set_range_parser.add_argument(
-    "heat", type=float, help="The minimum target temperature to set."
-)
-set_range_parser.add_argument(
-    "cool", type=float, help="The maximum target temperature to set."
-)
-generate_rtsp_stream_parser = cmd_parser.add_parser("generate_rtsp_stream")
-generate_rtsp_stream_parser.add_argument("device_id")
-generate_web_rtc_stream_parser = cmd_parser.add_parser("generate_web_rtc_stream")
-generate_web_rtc_stream_parser.add_argument("device_id")
-generate_web_rtc_stream_parser.add_argument("offer_file")
-subscribe_parser = cmd_parser.add_parser("subscribe")
-subscribe_parser.add_argument("subscription_id")
-subscribe_parser.add_argument("device_id", nargs="?")
+# Trait names used by the device commands
+_TEMP_SETPOINT = ThermostatTemperatureSetpointTrait.NAME
+_THERMOSTAT_MODE = ThermostatModeTrait.NAME
+_THERMOSTAT_ECO = ThermostatEcoTrait.NAME
+_LIVE_STREAM = CameraLiveStreamTrait.NAME
+
+# Connection pool settings so API calls within a run reuse open connections
+CONNECTION_LIMIT = 100
+DNS_CACHE_TTL_SECS = 300
+KEEPALIVE_TIMEOUT_SECS = 75
+# Fail a stuck API request instead of waiting for the aiohttp default of 5 min
+REQUEST_TIMEOUT_SECS = 30
+
+
+def BuildParser() -> argparse.ArgumentParser:
+    """Define command line arguments.
+
+    This is called from main rather than at import time.
+    """
+    parser = argparse.ArgumentParser(
+        description="Command line tool for Google Nest SDM API"
+    )
+    parser.add_argument("--project_id", required=True, help="Device Access program id")
+    parser.add_argument("--client_id", help="OAuth credentials client_id")
+    parser.add_argument("--client_secret", help="OAuth credentials client_secret")
+    parser.add_argument(
+        "--token_cache",
+        help="File storage for long lived creds",
+        default="~/.config/google_nest/token_cache",
+    )
+    parser.add_argument(
+        "-v", "--verbose", help="Increase output verbosity", action="store_true"
+    )
+    parser.add_argument(
+        "--output_type",
+        type=str,
+        choices=["json", "yaml"],
+        help="Change the output type from json or yaml (default).",
+        default="yaml",
+    )
+
+    cmd_parser = parser.add_subparsers(dest="command", required=True)
+    cmd_parser.add_parser("list_structures")
+    cmd_parser.add_parser("list_devices")
+    get_structure_parser = cmd_parser.add_parser("get_structure")
+    get_structure_parser.add_argument("structure_id")
+    get_device_parser = cmd_parser.add_parser("get_device")
+    get_device_parser.add_argument(
+        "device_id", nargs="+", help="One or more devices, fetched concurrently."
+    )
+    set_mode_parser = cmd_parser.add_parser(
+        "set_mode", description="Change the thermostat mode."
+    )
+    set_mode_parser.add_argument("device_id")
+    set_mode_parser.add_argument(
+        "mode",
+        help="The mode to change the thermostat to.",
+        choices=["MANUAL_ECO", "HEAT", "COOL", "HEATCOOL", "OFF"],
+    )
+    set_heat_parser = cmd_parser.add_parser(
+        "set_heat", description="Sets the target temperature when in HEAT mode."
+    )
+    set_heat_parser.add_argument("device_id")
+    set_heat_parser.add_argument("heat", type=float)
+    set_cool_parser = cmd_parser.add_parser(
+        "set_cool", help="Sets the target temperature when in COOL mode."
+    )
+    set_cool_parser.add_argument("device_id")
+    set_cool_parser.add_argument(
+        "cool",
+        type=float,
+        help="The target temperature to set when the thermostat is in COOL mode.",
+    )
+    set_range_parser = cmd_parser.add_parser(
+        "set_range", help="Sets the min/max temperature when in HEATCOOL mode."
+    )
+    set_range_parser.add_argument("device_id")
+    set_range_parser.add_argument(
+        "heat", type=float, help="The minimum target temperature to set."
+    )
+    set_range_parser.add_argument(
+        "cool", type=float, help="The maximum target temperature to set."
+    )
+    generate_rtsp_stream_parser = cmd_parser.add_parser("generate_rtsp_stream")
+    generate_rtsp_stream_parser.add_argument("device_id")
+    generate_web_rtc_stream_parser = cmd_parser.add_parser("generate_web_rtc_stream")
+    generate_web_rtc_stream_parser.add_argument("device_id")
+    generate_web_rtc_stream_parser.add_argument("offer_file")
+    subscribe_parser = cmd_parser.add_parser("subscribe")
+    subscribe_parser.add_argument("subscription_id")
+    subscribe_parser.add_argument("device_id", nargs="?")
+
+    return parser
 
 
 class Auth(AbstractAuth):
@@ -134,11 +154,28 @@ class Auth(AbstractAuth):
         """Initialize Google Nest Device Access auth."""
         super().__init__(websession, api_url)
         self._user_creds = user_creds
+        self._refresh_lock = asyncio.Lock()
 
     async def async_get_access_token(self) -> str:
-        """Return a valid access token."""
+        """Return a valid access token, refreshing it shortly before expiry."""
+        if not self._user_creds.valid:
+            async with self._refresh_lock:
+                # Another caller may have refreshed while waiting on the lock
+                if not self._user_creds.valid:
+                    await self._async_refresh()
         return cast(str, self._user_creds.token)
 
+    async def _async_refresh(self) -> None:
+        """Refresh the credentials without blocking the event loop."""
+        from google.auth.transport.requests import Request
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._user_creds.refresh, Request()
+            )
+        except RefreshError as err:
+            raise AuthException(f"Failed to refresh access token: {err}") from err
+
     async def async_get_creds(self) -> Credentials:
         """Return valid OAuth creds."""
         return self._user_creds
@@ -146,19 +183,31 @@ class Auth(AbstractAuth):
 
 def CreateCreds(args: argparse.Namespace) -> Credentials:
     """Run an interactive flow to get OAuth creds."""
-    creds = None
+    creds: UserCredentials | None = None
     token_cache = os.path.expanduser(args.token_cache)
-    if os.path.exists(token_cache):
-        with open(token_cache, "rb") as token:
-            creds = pickle.load(token)
+    try:
+        with open(token_cache, "r") as token:
+            creds = UserCredentials.from_authorized_user_info(
+                json.load(token), SDM_SCOPES
+            )
+    except FileNotFoundError:
+        pass
+    except ValueError as err:
+        logging.warning("Ignoring invalid token cache %s: %s", token_cache, err)
 
     # If there are no (valid) credentials available, let the user log in.
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
+            # Imported here since the OAuth libraries are only needed when the
+            # cached token can't be used as is.
+            from google.auth.transport.requests import Request
+
             creds.refresh(Request())
         else:
             if not args.client_id or not args.client_secret:
                 raise ValueError("Required flag --client_id or --client_secret missing")
+            from google_auth_oauthlib.flow import InstalledAppFlow
+
             client_config = {
                 "installed": {
                     "client_id": args.client_id,
@@ -174,31 +223,29 @@ def CreateCreds(args: argparse.Namespace) -> Credentials:
             )
             creds = app_flow.run_local_server()
         # Save the credentials for the next run
-        if not os.path.exists(os.path.dirname(token_cache)):
-            try:
-                os.makedirs(os.path.dirname(token_cache))
-            except OSError as exc:  # Guard against race condition
-                if exc.errno != errno.EEXIST:
-                    raise
-        with open(token_cache, "wb") as token:
-            pickle.dump(creds, token)
+        os.makedirs(os.path.dirname(token_cache), exist_ok=True)
+        with open(token_cache, "w") as token:
+            token.write(creds.to_json())
     return creds
 
 
-def PrintStructure(structure: Structure, output_type: str) -> None:
-    """Print the structure."""
+def GetFormatter(output_type: str | None) -> Callable[[dict[str, Any]], str]:
+    """Return a function that formats raw data as a block of output text."""
     if output_type == "json":
-        print(json.dumps(structure.raw_data))
-    else:
-        print(yaml.dump(structure.raw_data))
+        return lambda data: json.dumps(data) + "\n"
+    import yaml
 
+    try:
+        from yaml import CSafeDumper as Dumper
+    except ImportError:
+        from yaml import SafeDumper as Dumper  # type: ignore[assignment]
 
-def PrintDevice(device: Device, output_type: str) -> None:
-    """Print the device."""
-    if output_type == "json":
-        print(json.dumps(device.raw_data))
-    else:
-        print(yaml.dump(device.raw_data))
+    return lambda data: yaml.dump(data, Dumper=Dumper) + "\n"
+
+
+def PrintStructure(structure: Structure, output_type: str) -> None:
+    """Print the structure."""
+    sys.stdout.write(GetFormatter(output_type)(structure.raw_data))
 
 
 class SubscribeCallback:
@@ -206,14 +253,13 @@ class SubscribeCallback:
 
     def __init__(self, output_type: str | None = None) -> None:
         """Initialize SubscribeCallback."""
-        self._output_type = output_type
+        self._format = GetFormatter(output_type)
 
     async def async_handle_event(self, event_message: EventMessage) -> None:
         """Handle an EventMessage."""
-        if self._output_type == "json":
-            print(json.dumps(event_message.raw_data))
-        else:
-            print(yaml.dump(event_message.raw_data))
+        sys.stdout.write(self._format(event_message.raw_data))
+        # Emit each event promptly even when stdout is a pipe
+        sys.stdout.flush()
 
 
 class DeviceWatcherCallback:
@@ -222,120 +268,229 @@ class DeviceWatcherCallback:
     def __init__(self, device: Device, output_type: str) -> None:
         """Initialize DeviceWatcherCallback."""
         self._device = device
-        self._output_type = output_type
+        self._format = GetFormatter(output_type)
 
     async def async_handle_event(self, event_message: EventMessage) -> None:
         """Handle an EventMessage."""
-        print(f"event_id: {event_message.event_id}")
-        print("Current device state:")
-        PrintDevice(self._device, self._output_type)
-        print("")
+        sys.stdout.write(
+            "".join(
+                [
+                    f"event_id: {event_message.event_id}\n",
+                    "Current device state:\n",
+                    self._format(self._device.raw_data),
+                    "\n",
+                ]
+            )
+        )
+        sys.stdout.flush()
+
+
+async def ListStructures(
+    auth: AbstractAuth, api: GoogleNestAPI, args: argparse.Namespace
+) -> None:
+    """Print all structures."""
+    structures: list[Structure] = await api.async_get_structures()
+    formatter = GetFormatter(args.output_type)
+    sys.stdout.write("".join(formatter(s.raw_data) for s in structures))
+
+
+async def GetStructure(
+    auth: AbstractAuth, api: GoogleNestAPI, args: argparse.Namespace
+) -> None:
+    """Print a single structure."""
+    structure: Structure | None = await api.async_get_structure(args.structure_id)
+    assert structure
+    PrintStructure(structure, args.output_type)
+
+
+async def ListDevices(
+    auth: AbstractAuth, api: GoogleNestAPI, args: argparse.Namespace
+) -> None:
+    """Print all devices."""
+    devices = await api.async_get_devices()
+    formatter = GetFormatter(args.output_type)
+    sys.stdout.write("".join(formatter(d.raw_data) for d in devices))
+
+
+async def Subscribe(
+    auth: AbstractAuth, api: GoogleNestAPI, args: argparse.Namespace
+) -> None:
+    """Print events received from the subscriber."""
+    # Imported here since the Pub/Sub client libraries are slow to load and
+    # only needed by this command.
+    from .google_nest_subscriber import GoogleNestSubscriber
+
+    logging.info("Subscription: %s", args.subscription_id)
+    subscriber = GoogleNestSubscriber(auth, args.project_id, args.subscription_id)
+    if args.device_id:
+        device_manager = await subscriber.async_get_device_manager()
+        dev = device_manager.devices[args.device_id]
+        dev_callback = DeviceWatcherCallback(dev, args.output_type)
+        dev.add_event_callback(dev_callback.async_handle_event)
+    else:
+        sub_callback = SubscribeCallback(args.output_type)
+        subscriber.set_update_callback(sub_callback.async_handle_event)
+    await subscriber.start_async()
+    try:
+        # Idle until Ctrl-C, which the runner delivers as a cancellation
+        await asyncio.Event().wait()
+    finally:
+        await subscriber.stop_async()
+
+
+async def GetDevice(api: GoogleNestAPI, args: argparse.Namespace) -> Device:
+    """Fetch the device for commands that operate on a device_id."""
+    device: Device | None = await api.async_get_device(args.device_id)
+    assert device
+    return device
+
+
+async def PrintDeviceCommand(
+    auth: AbstractAuth, api: GoogleNestAPI, args: argparse.Namespace
+) -> None:
+    """Print one or more devices."""
+    if len(args.device_id) > 1:
+        # A single list request primes the lookups below instead of one
+        # request per device
+        await api.async_get_devices()
+    devices = await asyncio.gather(
+        *(api.async_get_device(device_id) for device_id in args.device_id)
+    )
+    formatter = GetFormatter(args.output_type)
+    output = []
+    for device in devices:
+        assert device
+        output.append(formatter(device.raw_data))
+    sys.stdout.write("".join(output))
+
+
+async def SetMode(
+    auth: AbstractAuth, api: GoogleNestAPI, args: argparse.Namespace
+) -> None:
+    """Change the thermostat mode."""
+    device = await GetDevice(api, args)
+    mode = args.mode
+    trait_name = _THERMOSTAT_ECO if mode == "MANUAL_ECO" else _THERMOSTAT_MODE
+    trait = device.traits[trait_name]
+    resp = await trait.set_mode(mode)
+    print(await resp.text())
+
+
+async def SetHeat(
+    auth: AbstractAuth, api: GoogleNestAPI, args: argparse.Namespace
+) -> None:
+    """Set the target temperature for HEAT mode."""
+    device = await GetDevice(api, args)
+    trait = device.traits[_TEMP_SETPOINT]
+    resp = await trait.set_heat(args.heat)
+    print(await resp.text())
+
+
+async def SetCool(
+    auth: AbstractAuth, api: GoogleNestAPI, args: argparse.Namespace
+) -> None:
+    """Set the target temperature for COOL mode."""
+    device = await GetDevice(api, args)
+    trait = device.traits[_TEMP_SETPOINT]
+    resp = await trait.set_cool(args.cool)
+    print(await resp.text())
+
+
+async def SetRange(
+    auth: AbstractAuth, api: GoogleNestAPI, args: argparse.Namespace
+) -> None:
+    """Set the min/max temperature for HEATCOOL mode."""
+    device = await GetDevice(api, args)
+    trait = device.traits[_TEMP_SETPOINT]
+    resp = await trait.set_range(args.heat, args.cool)
+    print(await resp.text())
+
+
+async def GenerateRtspStream(
+    auth: AbstractAuth, api: GoogleNestAPI, args: argparse.Namespace
+) -> None:
+    """Generate an RTSP live stream."""
+    device = await GetDevice(api, args)
+    trait = device.traits[_LIVE_STREAM]
+    stream = await trait.generate_rtsp_stream()
+    sys.stdout.write(
+        f"URL: {stream.rtsp_stream_url}\n"
+        f"Stream Token: {stream.stream_token}\n"
+        f"Expires At: {stream.expires_at}\n"
+    )
+
+
+async def GenerateWebRtcStream(
+    auth: AbstractAuth, api: GoogleNestAPI, args: argparse.Namespace
+) -> None:
+    """Generate a WebRTC live stream."""
+    device = await GetDevice(api, args)
+    trait = device.traits[_LIVE_STREAM]
+    offer_sdp = None
+    if args.offer_file:
+        f = open(args.offer_file, "r")
+        offer_sdp = f.read()
+    stream = await trait.generate_web_rtc_stream(offer_sdp)
+    sys.stdout.write(
+        f"Answer SDP: {stream.answer_sdp}\n"
+        f"Media Session Id: {stream.media_session_id}\n"
+        f"Expires At: {stream.expires_at}\n"
+    )
+
+
+COMMANDS: dict[
+    str,
+    Callable[[AbstractAuth, GoogleNestAPI, argparse.Namespace], Awaitable[None]],
+] = {
+    "list_structures": ListStructures,
+    "get_structure": GetStructure,
+    "list_devices": ListDevices,
+    "subscribe": Subscribe,
+    "get_device": PrintDeviceCommand,
+    "set_mode": SetMode,
+    "set_heat": SetHeat,
+    "set_cool": SetCool,
+    "set_range": SetRange,
+    "generate_rtsp_stream": GenerateRtspStream,
+    "generate_web_rtc_stream": GenerateWebRtcStream,
+}
 
 
 async def RunTool(args: argparse.Namespace, user_creds: Credentials) -> None:
     """Run the command."""
-    async with ClientSession() as client:
+    connector = TCPConnector(
+        limit=CONNECTION_LIMIT,
+        ttl_dns_cache=DNS_CACHE_TTL_SECS,
+        keepalive_timeout=KEEPALIVE_TIMEOUT_SECS,
+    )
+    timeout = ClientTimeout(total=REQUEST_TIMEOUT_SECS)
+    async with ClientSession(connector=connector, timeout=timeout) as client:
         auth = Auth(client, user_creds, API_URL)
-        api = GoogleNestAPI(auth, args.project_id)
-
-        if args.command == "list_structures":
-            structures: list[Structure] = await api.async_get_structures()
-            for s in structures:
-                PrintStructure(s, args.output_type)
-            return
-
-        if args.command == "get_structure":
-            structure: Structure | None = await api.async_get_structure(
-                args.structure_id
-            )
-            assert structure
-            PrintStructure(structure, args.output_type)
-            return
-
-        if args.command == "list_devices":
-            devices = await api.async_get_devices()
-            for d in devices:
-                PrintDevice(d, args.output_type)
-            return
-
-        if args.command == "subscribe":
-            logging.info("Subscription: %s", args.subscription_id)
-            subscriber = GoogleNestSubscriber(
-                auth, args.project_id, args.subscription_id
-            )
-            if args.device_id:
-                device_manager = await subscriber.async_get_device_manager()
-                dev = device_manager.devices[args.device_id]
-                dev_callback = DeviceWatcherCallback(dev, args.output_type)
-                dev.add_event_callback(dev_callback.async_handle_event)
-            else:
-                sub_callback = SubscribeCallback(args.output_type)
-                subscriber.set_update_callback(sub_callback.async_handle_event)
-            unsub = await subscriber.start_async()
-            try:
-                while True:
-                    await asyncio.sleep(10)
-            except KeyboardInterrupt:
-                unsub()
-
-        # All other commands require a device_id
-        device: Device | None = await api.async_get_device(args.device_id)
-        assert device
-
-        if args.command == "get_device":
-            PrintDevice(device, args.output_type)
-
-        if args.command == "set_mode":
-            mode = args.mode
-            trait = device.traits[ThermostatModeTrait.NAME]
-            if mode == "MANUAL_ECO":
-                trait = device.traits[ThermostatEcoTrait.NAME]
-            resp = await trait.set_mode(mode)
-            print(await resp.text())
-
-        if args.command == "set_heat":
-            trait = device.traits[ThermostatTemperatureSetpointTrait.NAME]
-            resp = await trait.set_heat(args.heat)
-            print(await resp.text())
-
-        if args.command == "set_cool":
-            trait = device.traits[ThermostatTemperatureSetpointTrait.NAME]
-            resp = await trait.set_cool(args.cool)
-            print(await resp.text())
-
-        if args.command == "set_range":
-            trait = device.traits[ThermostatTemperatureSetpointTrait.NAME]
-            resp = await trait.set_range(args.heat, args.cool)
-            print(await resp.text())
-
-        if args.command == "generate_rtsp_stream":
-            trait = device.traits[CameraLiveStreamTrait.NAME]
-            stream = await trait.generate_rtsp_stream()
-            print(f"URL: {stream.rtsp_stream_url}")
-            print(f"Stream Token: {stream.stream_token}")
-            print(f"Expires At: {stream.expires_at}")
-
-        if args.command == "generate_web_rtc_stream":
-            trait = device.traits[CameraLiveStreamTrait.NAME]
-            offer_sdp = None
-            if args.offer_file:
-                f = open(args.offer_file, "r")
-                offer_sdp = f.read()
-            stream = await trait.generate_web_rtc_stream(offer_sdp)
-            print(f"Answer SDP: {stream.answer_sdp}")
-            print(f"Media Session Id: {stream.media_session_id}")
-            print(f"Expires At: {stream.expires_at}")
+        # Each process runs one command, which looks devices up before any write
+        api = GoogleNestAPI(auth, args.project_id, cache_ttl=CACHE_TTL_SECONDS)
+        await COMMANDS[args.command](auth, api, args)
 
 
 def main() -> None:
     """Nest command line tool."""
-    args: argparse.Namespace = parser.parse_args()
+    args: argparse.Namespace = BuildParser().parse_args()
     if args.verbose:
         logging.basicConfig(level=logging.DEBUG)
     user_creds = CreateCreds(args)
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(RunTool(args, user_creds))
-    loop.close()
+    loop_factory: Callable[[], asyncio.AbstractEventLoop] | None = None
+    if args.command == "subscribe":
+        # Use uvloop for the long running subscriber when it is installed
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            loop_factory = uvloop.new_event_loop
+    try:
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(RunTool(args, user_creds))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
@@ -1,5 +1,9 @@
 """Library to access the Smart Device Management API."""
 
+import asyncio
+import time
+from typing import Any, Callable, Coroutine
+
 from .auth import AbstractAuth
 from .device import Device
 from .structure import Structure
@@ -10,51 +14,156 @@ STRUCTURES = "structures"
 DEVICES = "devices"
 NAME = "name"
 
+# Suggested cache_ttl for short lived callers that look up the same resources
+# repeatedly. Caching is off by default since writes made through device traits
+# do not invalidate the cache.
+CACHE_TTL_SECONDS = 5.0
+
 
 class GoogleNestAPI:
     """Client library to communicate with the Google Nest SDM API."""
 
-    def __init__(self, auth: AbstractAuth, project_id: str):
-        """Initialize the API and store the auth so we can make requests."""
+    def __init__(
+        self,
+        auth: AbstractAuth,
+        project_id: str,
+        cache_ttl: float = 0,
+    ):
+        """Initialize the API and store the auth so we can make requests.
+
+        When `cache_ttl` is set, individual device and structure lookups are
+        served from memory for that many seconds and return the same objects
+        as previous calls. Callers that change device state should call
+        `invalidate` so the next lookup reads the updated state.
+        """
         self._auth = auth
         self._project_id = project_id
+        self._structures_url = f"enterprises/{project_id}/structures"
+        self._devices_url = f"enterprises/{project_id}/devices"
+        self._cache_ttl = cache_ttl
+        self._device_cache: dict[str, tuple[float, Device]] = {}
+        self._structure_cache: dict[str, tuple[float, Structure]] = {}
+        self._device_inflight: dict[str, asyncio.Task[Device | None]] = {}
+        self._structure_inflight: dict[str, asyncio.Task[Structure | None]] = {}
+        # Bumped on invalidate so requests already in flight are not cached
+        self._cache_generation = 0
 
-    @property
-    def _structures_url(self) -> str:
-        return f"enterprises/{self._project_id}/structures"
+    def invalidate(self, resource_id: str | None = None) -> None:
+        """Drop cached lookups for a device or structure id, or all if None."""
+        self._cache_generation += 1
+        if resource_id is None:
+            self._device_cache.clear()
+            self._structure_cache.clear()
+            self._device_inflight.clear()
+            self._structure_inflight.clear()
+            return
+        self._device_cache.pop(resource_id, None)
+        self._structure_cache.pop(resource_id, None)
+        self._device_inflight.pop(resource_id, None)
+        self._structure_inflight.pop(resource_id, None)
 
     async def async_get_structures(self) -> list[Structure]:
         """Return the structures."""
+        generation = self._cache_generation
         response_data = await self._auth.get_json(self._structures_url)
-        if STRUCTURES not in response_data:
-            return []
-        structures = response_data[STRUCTURES]
-        return [
-            Structure.MakeStructure(structure_data) for structure_data in structures
+        structures = [
+            Structure.MakeStructure(structure_data)
+            for structure_data in response_data.get(STRUCTURES) or ()
         ]
+        if self._cache_ttl > 0 and generation == self._cache_generation:
+            # Serve individual lookups from this response for a short time
+            now = time.monotonic()
+            for structure in structures:
+                self._structure_cache[_resource_id(structure.name)] = (now, structure)
+        return structures
 
     async def async_get_structure(self, structure_id: str) -> Structure | None:
         """Return a structure device."""
+        if cached := self._structure_cache.get(structure_id):
+            timestamp, structure = cached
+            if time.monotonic() - timestamp < self._cache_ttl:
+                return structure
+        return await _async_single_flight(
+            self._structure_inflight,
+            structure_id,
+            lambda: self._async_fetch_structure(structure_id),
+        )
+
+    async def _async_fetch_structure(self, structure_id: str) -> Structure | None:
+        """Fetch a structure from the API and cache the result."""
+        generation = self._cache_generation
         data = await self._auth.get_json(f"{self._structures_url}/{structure_id}")
         if NAME not in data:
             return None
-        return Structure.MakeStructure(data)
-
-    @property
-    def _devices_url(self) -> str:
-        return f"enterprises/{self._project_id}/devices"
+        structure = Structure.MakeStructure(data)
+        if self._cache_ttl > 0 and generation == self._cache_generation:
+            self._structure_cache[structure_id] = (time.monotonic(), structure)
+        return structure
 
     async def async_get_devices(self) -> list[Device]:
         """Return the devices."""
+        generation = self._cache_generation
         response_data = await self._auth.get_json(self._devices_url)
-        if DEVICES not in response_data:
-            return []
-        devices = response_data[DEVICES]
-        return [Device.MakeDevice(device_data, self._auth) for device_data in devices]
+        devices = [
+            Device.MakeDevice(device_data, self._auth)
+            for device_data in response_data.get(DEVICES) or ()
+        ]
+        if self._cache_ttl > 0 and generation == self._cache_generation:
+            # Serve individual lookups from this response for a short time
+            now = time.monotonic()
+            for device in devices:
+                self._device_cache[_resource_id(device.name)] = (now, device)
+        return devices
 
     async def async_get_device(self, device_id: str) -> Device | None:
         """Return a specific device."""
+        if cached := self._device_cache.get(device_id):
+            timestamp, device = cached
+            if time.monotonic() - timestamp < self._cache_ttl:
+                return device
+        return await _async_single_flight(
+            self._device_inflight,
+            device_id,
+            lambda: self._async_fetch_device(device_id),
+        )
+
+    async def _async_fetch_device(self, device_id: str) -> Device | None:
+        """Fetch a device from the API and cache the result."""
+        generation = self._cache_generation
         data = await self._auth.get_json(f"{self._devices_url}/{device_id}")
         if NAME not in data:
             return None
-        return Device.MakeDevice(data, self._auth)
+        device = Device.MakeDevice(data, self._auth)
+        if self._cache_ttl > 0 and generation == self._cache_generation:
+            self._device_cache[device_id] = (time.monotonic(), device)
+        return device
+
+
+def _resource_id(name: str) -> str:
+    """Return the id from a full resource name like enterprises/*/devices/*."""
+    return name.rsplit("/", 1)[-1]
+
+
+async def _async_single_flight[_T](
+    inflight: dict[str, asyncio.Task[_T]],
+    key: str,
+    fetch: Callable[[], Coroutine[Any, Any, _T]],
+) -> _T:
+    """Run fetch once for concurrent callers requesting the same key.
+
+    The shared task is shielded so that one caller being cancelled does not
+    cancel the request for the other callers.
+    """
+    if (task := inflight.get(key)) is None:
+        task = asyncio.create_task(fetch())
+        inflight[key] = task
+
+        def _done(done_task: asyncio.Task[_T]) -> None:
+            if inflight.get(key) is done_task:
+                del inflight[key]
+            # Mark the result retrieved in case every caller was cancelled
+            if not done_task.cancelled():
+                done_task.exception()
+
+        task.add_done_callback(_done)
+    return await asyncio.shield(task)
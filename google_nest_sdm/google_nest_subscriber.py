@@ -9,8 +9,14 @@ import re
 import time
 from typing import Awaitable, Callable
 
-
-from .auth import AbstractAuth
+# OAuth and API constants are defined in auth and re-exported here
+from .auth import (  # noqa: F401
+    API_URL,
+    OAUTH2_AUTHORIZE_FORMAT,
+    OAUTH2_TOKEN,
+    SDM_SCOPES,
+    AbstractAuth,
+)
 from .device_manager import DeviceManager
 from .diagnostics import SUBSCRIBER_DIAGNOSTICS as DIAGNOSTICS
 from .event import EventMessage
@@ -21,6 +27,7 @@ from .exceptions import (
 )
 from .google_nest_api import GoogleNestAPI
 from .streaming_manager import StreamingManager, Message
+from .thermostat_traits import ThermostatModeTrait
 
 __all__ = [
     "GoogleNestSubscriber",
@@ -31,23 +38,13 @@ __all__ = [
 _LOGGER = logging.getLogger(__name__)
 
 # Used to catch invalid subscriber id
-EXPECTED_SUBSCRIBER_REGEXP = re.compile("projects/.*/subscriptions/.*")
+EXPECTED_SUBSCRIBER_REGEXP = re.compile("projects/[^/]+/subscriptions/[^/]+")
 
 MESSAGE_ACK_TIMEOUT_SECONDS = 30.0
 
 # Note: Users of non-prod instances will have to manually configure a topic
 TOPIC_FORMAT = "projects/sdm-prod/topics/enterprise-{project_id}"
 
-OAUTH2_AUTHORIZE_FORMAT = (
-    "https://nestservices.google.com/partnerconnections/{project_id}/auth"
-)
-OAUTH2_TOKEN = "https://www.googleapis.com/oauth2/v4/token"
-SDM_SCOPES = [
-    "https://www.googleapis.com/auth/sdm.service",
-    "https://www.googleapis.com/auth/pubsub",
-]
-API_URL = "https://smartdevicemanagement.googleapis.com/v1"
-
 
 class ApiEnv(enum.Enum):
     PROD = (OAUTH2_AUTHORIZE_FORMAT, API_URL)
@@ -86,7 +83,7 @@ def _validate_subscription_name(subscription_name: str) -> None:
 
     Raises ConfigurationException on failure.
     """
-    if not EXPECTED_SUBSCRIBER_REGEXP.match(subscription_name):
+    if not EXPECTED_SUBSCRIBER_REGEXP.fullmatch(subscription_name):
         DIAGNOSTICS.increment("subscription_name_invalid")
         _LOGGER.debug("Subscription name did not match pattern: %s", subscription_name)
         raise ConfigurationException(
@@ -111,8 +108,10 @@ class GoogleNestSubscriber:
         self._project_id = project_id
         self._api = GoogleNestAPI(auth, project_id)
         self._device_manager_task: asyncio.Task[DeviceManager] | None = None
+        self._device_manager: DeviceManager | None = None
         self._callback: Callable[[EventMessage], Awaitable[None]] | None = None
         self._cache_policy = CachePolicy()
+        self._stream: StreamingManager | None = None
 
     @property
     def subscription_name(self) -> str:
@@ -141,6 +140,7 @@ class GoogleNestSubscriber:
 
         Returns a callable used to stop/cancel the subscription. Received
         messages are passed to the callback provided to `set_update_callback`.
+        Use `stop_async` instead to also wait for media still being written.
         """
         _validate_subscription_name(self._subscription_name)
         _LOGGER.debug("Starting subscription %s", self._subscription_name)
@@ -152,8 +152,21 @@ class GoogleNestSubscriber:
             callback=self._async_message_callback_with_timeout,
         )
         await stream.start()
+        self._stream = stream
         return stream.stop
 
+    async def stop_async(self) -> None:
+        """Stop the subscription and wait for pending media writes.
+
+        Event media is written in the background after callbacks are invoked,
+        so this should be awaited on shutdown to avoid losing media.
+        """
+        if self._stream:
+            self._stream.stop()
+            self._stream = None
+        if self._device_manager:
+            await self._device_manager.async_flush_media()
+
     @property
     def cache_policy(self) -> CachePolicy:
         """Return cache policy shared by device EventMediaManager objects."""
@@ -170,69 +183,71 @@ class GoogleNestSubscriber:
     async def _async_create_device_manager(self) -> DeviceManager:
         """Create a DeviceManager, populated with initial state."""
         device_manager = DeviceManager(self._cache_policy)
-        structures = await self._api.async_get_structures()
+        # Subscriber starts after a device fetch. Structures and devices are
+        # independent requests so they are fetched concurrently.
+        structures, devices = await asyncio.gather(
+            self._api.async_get_structures(), self._api.async_get_devices()
+        )
         for structure in structures:
             device_manager.add_structure(structure)
-        # Subscriber starts after a device fetch
-        devices = await self._api.async_get_devices()
         for device in devices:
             device_manager.add_device(device)
         if self._callback:
             device_manager.set_update_callback(self._callback)
+        self._device_manager = device_manager
         return device_manager
 
     async def _async_message_callback_with_timeout(self, message: Message) -> None:
         """Handle a received message."""
         try:
-            async with asyncio.timeout(MESSAGE_ACK_TIMEOUT_SECONDS):
+            async with asyncio.timeout(MESSAGE_ACK_TIMEOUT_SECONDS) as timeout:
                 await self._async_message_callback(message)
         except TimeoutError as err:
+            if not timeout.expired():
+                # A timeout raised by the handler itself, not the ack deadline
+                DIAGNOSTICS.increment("message_callback_timeout")
+                raise
             DIAGNOSTICS.increment("message_ack_timeout")
             raise TimeoutError("Message ack timeout processing message") from err
 
     async def _async_message_callback(self, message: Message) -> None:
         """Handle a received message."""
-        event = EventMessage.create_event(message.payload, self._auth)
-        recv = time.time()
-        latency_ms = int((recv - event.timestamp.timestamp()) * 1000)
-        DIAGNOSTICS.elapsed("message_received", latency_ms)
         # Only accept device events once the Device Manager has been loaded.
         # We are ok with missing messages on startup since the device manager
-        # will do a live read. This checks for an exception to avoid throwing
-        # inside the pubsub callback and further wedging the pubsub client library.
-        if (
-            self._device_manager_task
-            and self._device_manager_task.done()
-            and not self._device_manager_task.exception()
-        ):
-            device_manager = self._device_manager_task.result()
-            if _is_invalid_thermostat_trait_update(event):
-                _LOGGER.debug(
-                    "Ignoring event with invalid update traits; Refreshing devices: %s",
-                    event.resource_update_traits,
-                )
-                await _hack_refresh_devices(self._api, device_manager)
-            else:
-                await device_manager.async_handle_event(event)
-
-        process_latency_ms = int((time.time() - recv) * 1000)
+        # will do a live read. The device manager is only set once it loaded
+        # successfully, which avoids throwing inside the pubsub callback and
+        # further wedging the pubsub client library. Messages dropped here are
+        # not parsed at all.
+        if (device_manager := self._device_manager) is None:
+            DIAGNOSTICS.increment("message_dropped")
+            return
+        event = EventMessage.create_event(message.payload, self._auth)
+        recv_ns = time.monotonic_ns()
+        # Delivery latency compares against the publish time so needs the wall
+        # clock; processing time below uses the monotonic clock.
+        latency_ms = int((time.time() - event.timestamp.timestamp()) * 1000)
+        DIAGNOSTICS.elapsed("message_received", latency_ms)
+        if _is_invalid_thermostat_trait_update(event):
+            _LOGGER.debug(
+                "Ignoring event with invalid update traits; Refreshing devices: %s",
+                event.resource_update_traits,
+            )
+            await _hack_refresh_devices(self._api, device_manager)
+        else:
+            await device_manager.async_handle_event(event)
+
+        process_latency_ms = (time.monotonic_ns() - recv_ns) // 1_000_000
         DIAGNOSTICS.elapsed("message_processed", process_latency_ms)
 
 
 def _is_invalid_thermostat_trait_update(event: EventMessage) -> bool:
     """Return true if this is an invalid thermostat trait update."""
-    if (
-        event.resource_update_traits is not None
-        and (
-            thermostat_mode := event.resource_update_traits.get(
-                "sdm.devices.traits.ThermostatMode"
-            )
-        )
-        and (available_modes := thermostat_mode.get("availableModes")) is not None
-        and available_modes == ["OFF"]
-    ):
-        return True
-    return False
+    # Most events are not thermostat updates and stop at the first lookup
+    return bool(
+        (traits := event.resource_update_traits)
+        and (thermostat_mode := traits.get(ThermostatModeTrait.NAME))
+        and thermostat_mode.get("availableModes") == ["OFF"]
+    )
 
 
 async def _hack_refresh_devices(
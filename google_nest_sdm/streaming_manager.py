@@ -6,6 +6,8 @@ import asyncio
 import datetime
 import logging
 import json
+import random
+import time
 from typing import Awaitable, Callable, AsyncIterable, Any, TYPE_CHECKING
 
 from google import pubsub_v1
@@ -26,11 +28,20 @@ NEW_SUBSCRIBER_TIMEOUT_SECONDS = 30.0
 MIN_BACKOFF_INTERVAL = datetime.timedelta(seconds=10)
 MAX_BACKOFF_INTERVAL = datetime.timedelta(minutes=10)
 BACKOFF_MULTIPLIER = 1.5
+# A connection that stayed up this long resets the backoff when it drops, even
+# if no messages were received while it was connected.
+BACKOFF_RESET_INTERVAL = datetime.timedelta(minutes=10)
+
+# Acknowledge right away once this many messages are pending, rather than
+# waiting for the next periodic streaming pull request.
+ACK_BATCH_SIZE = 64
 
 
 class Message:
     """A message from the Pub/Sub stream."""
 
+    __slots__ = ("_message", "_payload")
+
     def __init__(self, message: pubsub_v1.types.PubsubMessage) -> None:
         """Initialize the message."""
         self._message = message
@@ -40,7 +51,7 @@ class Message:
     def payload(self) -> dict[str, Any]:
         """Get the payload of the message."""
         if self._payload is None:
-            self._payload = json.loads(bytes.decode(self._message.data)) or {}
+            self._payload = json.loads(self._message.data) or {}
         return self._payload
 
     @classmethod
@@ -80,6 +91,8 @@ class StreamingManager:
         self._healthy = True
         loop = asyncio.get_event_loop()
         self._background_task = loop.create_task(self._run_task())
+        # Let the task begin so that cancelling it always runs its cleanup
+        await asyncio.sleep(0)
 
     @property
     def healthy(self) -> bool:
@@ -102,6 +115,9 @@ class StreamingManager:
         except Exception as err:
             _LOGGER.info("Uncaught error in subscription loop: %s", err)
             DIAGNOSTICS.increment("uncaught_exception")
+        finally:
+            # Release the gRPC channel once the stream is no longer using it
+            await self._subscriber_client.close()
         self._healthy = False
 
     async def _run(self) -> None:
@@ -112,6 +128,7 @@ class StreamingManager:
                 assert self._stream is not None
             self._healthy = True
             _LOGGER.info("Event stream connection established")
+            connected_at = time.monotonic()
             try:
                 async for response in self._stream:
                     _LOGGER.debug(
@@ -122,16 +139,23 @@ class StreamingManager:
                     for received_message in response.received_messages:
                         if await self._process_message(received_message.message):
                             self._ack_ids.append(received_message.ack_id)
+                    if len(self._ack_ids) >= ACK_BATCH_SIZE:
+                        await self._flush_ack_ids()
             except GoogleNestException as err:
                 _LOGGER.info("Disconnected from event stream: %s", err)
                 DIAGNOSTICS.increment("exception")
             self._healthy = False
+            if (
+                time.monotonic() - connected_at
+                >= BACKOFF_RESET_INTERVAL.total_seconds()
+            ):
+                self._backoff = MIN_BACKOFF_INTERVAL
 
             while True:
-                _LOGGER.debug(
-                    "Reconnecting stream in %s seconds", self._backoff.total_seconds()
-                )
-                await asyncio.sleep(self._backoff.total_seconds())
+                # Full jitter spreads out clients reconnecting after an outage
+                delay = random.uniform(0, self._backoff.total_seconds())
+                _LOGGER.debug("Reconnecting stream in %.1f seconds", delay)
+                await asyncio.sleep(delay)
                 try:
                     self._stream = await self._connect()
                     break
@@ -148,6 +172,18 @@ class StreamingManager:
         DIAGNOSTICS.increment("connect")
         return await self._subscriber_client.streaming_pull(self.pending_ack_ids)
 
+    async def _flush_ack_ids(self) -> None:
+        """Acknowledge all pending messages now."""
+        ack_ids = self.pending_ack_ids()
+        DIAGNOSTICS.increment("flush_ack_ids")
+        try:
+            await self._subscriber_client.ack_messages(ack_ids)
+        except GoogleNestException as err:
+            _LOGGER.debug("Error acknowledging messages: %s", err)
+            DIAGNOSTICS.increment("flush_ack_ids_error")
+            # Retry with the next streaming pull request
+            self._ack_ids.extend(ack_ids)
+
     def pending_ack_ids(self) -> list[str]:
         """Generate the ack IDs for the next streaming pull request and clear."""
         ack_ids = [*self._ack_ids]
@@ -158,12 +194,17 @@ class StreamingManager:
         """Process an incoming message from the stream."""
         DIAGNOSTICS.increment("process_message")
         try:
-            async with asyncio.timeout(MESSAGE_ACK_TIMEOUT_SECONDS):
+            async with asyncio.timeout(MESSAGE_ACK_TIMEOUT_SECONDS) as timeout:
                 await self._callback(Message(message))
                 return True
         except TimeoutError as err:
-            DIAGNOSTICS.increment("process_message_timeout")
-            _LOGGER.info("Unexpected timeout while processing message: %s", err)
+            if timeout.expired():
+                DIAGNOSTICS.increment("process_message_timeout")
+                _LOGGER.info("Unexpected timeout while processing message: %s", err)
+                return False
+            # A timeout raised by the callback itself, not the ack deadline
+            DIAGNOSTICS.increment("process_message_exception")
+            _LOGGER.info("Uncaught error while processing message: %s", err)
             return False
         except Exception as err:
             DIAGNOSTICS.increment("process_message_exception")
@@ -30,6 +30,10 @@ RPC_TIMEOUT_SECONDS = 10.0
 STREAM_ACK_TIMEOUT_SECONDS = 180
 STREAM_ACK_FREQUENCY_SECONDS = 90
 
+# Flow control limits for messages delivered but not yet acknowledged
+MAX_OUTSTANDING_MESSAGES = 1000
+MAX_OUTSTANDING_BYTES = 100 * 1024 * 1024
+
 
 def refresh_creds(creds: Credentials) -> Credentials:
     """Refresh credentials.
@@ -104,6 +108,8 @@ async def pull_request_generator(
     yield pubsub_v1.StreamingPullRequest(
         subscription=subscription_name,
         stream_ack_deadline_seconds=STREAM_ACK_TIMEOUT_SECONDS,
+        max_outstanding_messages=MAX_OUTSTANDING_MESSAGES,
+        max_outstanding_bytes=MAX_OUTSTANDING_BYTES,
     )
     while True:
         ids = ack_ids_generator()
@@ -158,6 +164,9 @@ class SubscriberClient:
         self._subscription_name = subscription_name
         self._client: pubsub_v1.SubscriberAsyncClient | None = None
         self._creds: Credentials | None = None
+        # Clients replaced after creds expired, which may still be in use by
+        # an active stream until the next streaming pull
+        self._stale_clients: list[pubsub_v1.SubscriberAsyncClient] = []
 
     async def _async_get_client(self) -> pubsub_v1.SubscriberAsyncClient:
         """Create the Pub/Sub client library."""
@@ -168,9 +177,28 @@ class SubscriberClient:
                 DIAGNOSTICS.increment("create_subscription.creds_error")
                 raise AuthException(f"Access token failure: {err}") from err
             self._creds = creds
+            if self._client is not None:
+                self._stale_clients.append(self._client)
             self._client = pubsub_v1.SubscriberAsyncClient(credentials=self._creds)
         return self._client
 
+    async def close(self) -> None:
+        """Close the Pub/Sub client and its channel, if one was created."""
+        await self._async_close_stale_clients()
+        if self._client is None:
+            return
+        client = self._client
+        self._client = None
+        self._creds = None
+        await _async_close_client(client)
+
+    async def _async_close_stale_clients(self) -> None:
+        """Close clients that were replaced when creds expired."""
+        stale_clients = self._stale_clients
+        self._stale_clients = []
+        for client in stale_clients:
+            await _async_close_client(client)
+
     @exception_handler(func_name="streaming_pull")
     async def streaming_pull(
         self,
@@ -179,6 +207,8 @@ class SubscriberClient:
         """Start the streaming pull."""
 
         client = await self._async_get_client()
+        # Any previous stream has ended, so replaced clients are no longer used
+        await self._async_close_stale_clients()
         _LOGGER.debug("Sending streaming pull request for %s", self._subscription_name)
         stream = await client.streaming_pull(
             requests=pull_request_generator(self._subscription_name, ack_ids_generator)
@@ -196,3 +226,11 @@ class SubscriberClient:
             subscription=self._subscription_name,
             ack_ids=ack_ids,
         )
+
+
+async def _async_close_client(client: pubsub_v1.SubscriberAsyncClient) -> None:
+    """Close the Pub/Sub client channel."""
+    try:
+        await client.transport.close()  # type: ignore[no-untyped-call]
+    except Exception as err:
+        _LOGGER.debug("Error closing subscriber client: %s", err)
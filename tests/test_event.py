@@ -491,3 +491,34 @@ def test_missing_preview_url(
                 "userId": "AVPHwEuBfnPOnTqzVFT4IONX2Qqhu9EJ4ubO-bNnQ-yi",
             }
         )
+
+
+def test_is_expired_at(
+    fake_event_message: Callable[[Dict[str, Any]], EventMessage]
+) -> None:
+    event = fake_event_message(
+        {
+            "eventId": "0120ecc7-3b57-4eb4-9941-91609f189fb4",
+            "timestamp": "2019-01-01T00:00:01Z",
+            "resourceUpdate": {
+                "name": "enterprises/project-id/devices/device-id",
+                "events": {
+                    "sdm.devices.events.CameraSound.Sound": {
+                        "eventSessionId": "CjY5Y3VKaTZwR3o4Y19YbTVfMF...",
+                        "eventId": "FWWVQVUdGNUlTU2V4MGV2aTNXV...",
+                    }
+                },
+            },
+            "userId": "AVPHwEuBfnPOnTqzVFT4IONX2Qqhu9EJ4ubO-bNnQ-yi",
+        }
+    )
+    events = event.resource_update_events
+    assert events is not None
+    e = events["sdm.devices.events.CameraSound.Sound"]
+    assert e.is_expired
+    assert not e.is_expired_at(
+        datetime.datetime(2019, 1, 1, 0, 0, 30, tzinfo=datetime.timezone.utc)
+    )
+    assert e.is_expired_at(
+        datetime.datetime(2019, 1, 1, 0, 0, 32, tzinfo=datetime.timezone.utc)
+    )
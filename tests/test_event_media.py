@@ -1,5 +1,6 @@
 """Tests for event_media.py"""
 
+import asyncio
 import datetime
 from typing import Any, Awaitable, Callable, Dict
 from unittest.mock import patch
@@ -10,6 +11,7 @@ import aiohttp
 
 from google_nest_sdm import diagnostics, google_nest_api
 from google_nest_sdm.device import Device
+from google_nest_sdm.device_manager import DeviceManager
 from google_nest_sdm.event import EventMessage, EventToken
 from google_nest_sdm.event_media import InMemoryEventMediaStore
 from google_nest_sdm.transcoder import Transcoder
@@ -439,6 +441,166 @@ async def test_prefetch_image_failure_in_session(
     )
 
 
+@pytest.mark.parametrize("device_traits", [IMAGE_CAMERA_TRAITS])
+async def test_prefetch_multiple_sessions(
+    media_router: MediaRouter,
+    device: Device,
+    event_message: Callable[[Dict[str, Any]], Awaitable[EventMessage]],
+) -> None:
+    """Exercise a single message with multiple sessions that are all fetched."""
+    media_router.image(device.name)
+    media_router.image(device.name)
+
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    await device.async_handle_event(
+        await event_message(
+            {
+                "eventId": "0120ecc7-1",
+                "timestamp": now.isoformat(timespec="seconds"),
+                "resourceUpdate": {
+                    "name": device.name,
+                    "events": {
+                        "sdm.devices.events.CameraMotion.Motion": {
+                            "eventSessionId": "CjY5Y...1...",
+                            "eventId": "FWWVQVU..1...",
+                        },
+                        "sdm.devices.events.CameraPerson.Person": {
+                            "eventSessionId": "CjY5Y...2...",
+                            "eventId": "FWWVQVU..2...",
+                        },
+                    },
+                },
+                "userId": "AVPHwEuBfnPOnTqzVFT4IONX2Qqhu9EJ4ubO-bNnQ-yi",
+            }
+        )
+    )
+
+    event_media_manager = device.event_media_manager
+    events = list(await event_media_manager.async_image_sessions())
+    assert len(events) == 2
+    session_ids = {EventToken.decode(e.event_token).event_session_id for e in events}
+    assert session_ids == {"CjY5Y...1...", "CjY5Y...2..."}
+    for event in events:
+        media = await event_media_manager.get_media_from_token(event.event_token)
+        assert media
+        assert media.contents.startswith(b"image-bytes-")
+
+    event_media_diagnostics = device.get_diagnostics()["event_media"]
+    assert event_media_diagnostics["event.fetch"] == 2
+    assert event_media_diagnostics["fetch_image.save"] == 2
+    assert "event.fetch_error" not in event_media_diagnostics
+
+
+class SlowEventMediaStore(InMemoryEventMediaStore):
+    """An EventMediaStore where media writes block until released."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def async_save_media(self, media_key: str, content: bytes) -> None:
+        await self.release.wait()
+        await super().async_save_media(media_key, content)
+
+
+@pytest.mark.parametrize("device_traits", [IMAGE_CAMERA_TRAITS])
+async def test_media_saved_in_background(
+    media_router: MediaRouter,
+    device: Device,
+    event_message: Callable[[Dict[str, Any]], Awaitable[EventMessage]],
+) -> None:
+    """Exercise notifying before media is written, then reading it back."""
+    store = SlowEventMediaStore()
+    event_media_manager = device.event_media_manager
+    event_media_manager.cache_policy.store = store
+    callback = EventCallback()
+    event_media_manager.set_update_callback(callback.async_handle_event)
+    media_router.image(device.name)
+
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    await device.async_handle_event(
+        await event_message(
+            {
+                "eventId": "0120ecc7-1",
+                "timestamp": now.isoformat(timespec="seconds"),
+                "resourceUpdate": {
+                    "name": device.name,
+                    "events": {
+                        "sdm.devices.events.CameraMotion.Motion": {
+                            "eventSessionId": "CjY5Y.......",
+                            "eventId": "FWWVQVU..1...",
+                        },
+                    },
+                },
+                "userId": "AVPHwEuBfnPOnTqzVFT4IONX2Qqhu9EJ4ubO-bNnQ-yi",
+            }
+        )
+    )
+    assert callback.invoked
+
+    events = list(await event_media_manager.async_image_sessions())
+    assert len(events) == 1
+    load = asyncio.create_task(
+        event_media_manager.get_media_from_token(events[0].event_token)
+    )
+    await asyncio.sleep(0)
+    assert not load.done()
+
+    store.release.set()
+    media = await load
+    assert media
+    assert media.contents.startswith(b"image-bytes-")
+
+    await event_media_manager.async_flush_media()
+
+
+@pytest.mark.parametrize("device_traits", [IMAGE_CAMERA_TRAITS])
+async def test_device_manager_flush_media(
+    media_router: MediaRouter,
+    device: Device,
+    event_message: Callable[[Dict[str, Any]], Awaitable[EventMessage]],
+) -> None:
+    """Exercise waiting for background media writes before shutdown."""
+    store = SlowEventMediaStore()
+    device_manager = DeviceManager()
+    device_manager.cache_policy.store = store
+    device_manager.cache_policy.fetch = True
+    device_manager.add_device(device)
+    callback = EventCallback()
+    device_manager.set_update_callback(callback.async_handle_event)
+    media_router.image(device.name)
+
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    await device_manager.async_handle_event(
+        await event_message(
+            {
+                "eventId": "0120ecc7-1",
+                "timestamp": now.isoformat(timespec="seconds"),
+                "resourceUpdate": {
+                    "name": device.name,
+                    "events": {
+                        "sdm.devices.events.CameraMotion.Motion": {
+                            "eventSessionId": "CjY5Y.......",
+                            "eventId": "FWWVQVU..1...",
+                        },
+                    },
+                },
+                "userId": "AVPHwEuBfnPOnTqzVFT4IONX2Qqhu9EJ4ubO-bNnQ-yi",
+            }
+        )
+    )
+    assert callback.invoked
+
+    flush = asyncio.create_task(device_manager.async_flush_media())
+    await asyncio.sleep(0)
+    assert not flush.done()
+    assert not store._media
+
+    store.release.set()
+    await flush
+    assert len(store._media) == 1
+
+
 @pytest.mark.parametrize(("device", "mock_event_media_manager"), [(None, None)])
 async def test_multi_device_events(
     media_router: MediaRouter,
@@ -1643,6 +1805,15 @@ async def test_unsupported_event_trait(
     assert len(list(await event_media_manager.async_image_sessions())) == 0
     assert len(list(await event_media_manager.async_clip_preview_sessions())) == 0
 
+    event_media_diagnostics = device.get_diagnostics()["event_media"]
+    assert (
+        event_media_diagnostics[
+            "event.unsupported.sdm.devices.events.CameraClipPreview.ClipPreview"
+        ]
+        == 1
+    )
+    assert "event.new" not in event_media_diagnostics
+
 
 @pytest.mark.parametrize("device_traits", [IMAGE_DOORBELL_TRAITS])
 async def test_unknown_event_type(device: Device) -> None:
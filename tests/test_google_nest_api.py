@@ -1,3 +1,4 @@
+import asyncio
 import json
 from typing import Awaitable, Callable
 from unittest.mock import patch
@@ -27,6 +28,19 @@ from .conftest import (
 )
 
 
+@pytest.fixture(name="cached_api_client")
+def mock_cached_api_client(
+    auth_client: Callable[[], Awaitable[AbstractAuth]],
+) -> Callable[[], Awaitable[google_nest_api.GoogleNestAPI]]:
+    async def make_api() -> google_nest_api.GoogleNestAPI:
+        auth = await auth_client()
+        return google_nest_api.GoogleNestAPI(
+            auth, PROJECT_ID, cache_ttl=google_nest_api.CACHE_TTL_SECONDS
+        )
+
+    return make_api
+
+
 async def test_get_device(
     device_handler: DeviceHandler,
     api_client: Callable[[], Awaitable[google_nest_api.GoogleNestAPI]],
@@ -40,6 +54,70 @@ async def test_get_device(
     assert device.name == device_id
     assert device.type == "sdm.devices.types.device-type"
 
+    # Lookups are not cached by default, and the lookup handler has no replies
+    with pytest.raises(ApiException):
+        await api.async_get_device(device_id.split("/")[-1])
+
+
+async def test_get_device_cached(
+    device_handler: DeviceHandler,
+    cached_api_client: Callable[[], Awaitable[google_nest_api.GoogleNestAPI]],
+) -> None:
+    device_id = device_handler.add_device(device_type="sdm.devices.types.device-type")
+
+    api = await cached_api_client()
+
+    device = await api.async_get_device(device_id.split("/")[-1])
+    assert device
+    assert device.name == device_id
+
+    # The lookup handler only has a single reply so this is served from cache
+    cached_device = await api.async_get_device(device_id.split("/")[-1])
+    assert cached_device is device
+
+    # Invalidating sends the next lookup to the server, which has no replies
+    api.invalidate(device_id.split("/")[-1])
+    with pytest.raises(ApiException):
+        await api.async_get_device(device_id.split("/")[-1])
+
+
+async def test_get_device_cache_expired(
+    device_handler: DeviceHandler,
+    cached_api_client: Callable[[], Awaitable[google_nest_api.GoogleNestAPI]],
+) -> None:
+    device_id = device_handler.add_device(device_type="sdm.devices.types.device-type")
+
+    api = await cached_api_client()
+
+    with patch("google_nest_sdm.google_nest_api.time.monotonic", return_value=0):
+        device = await api.async_get_device(device_id.split("/")[-1])
+    assert device
+
+    # Expired entries are fetched again, and the lookup handler has no replies
+    with patch(
+        "google_nest_sdm.google_nest_api.time.monotonic",
+        return_value=google_nest_api.CACHE_TTL_SECONDS,
+    ), pytest.raises(ApiException):
+        await api.async_get_device(device_id.split("/")[-1])
+
+
+async def test_get_device_concurrent_lookups(
+    device_handler: DeviceHandler,
+    api_client: Callable[[], Awaitable[google_nest_api.GoogleNestAPI]],
+) -> None:
+    device_id = device_handler.add_device(device_type="sdm.devices.types.device-type")
+
+    api = await api_client()
+
+    # The lookup handler only has a single reply, so all callers share it
+    devices = await asyncio.gather(
+        *[api.async_get_device(device_id.split("/")[-1]) for _ in range(3)]
+    )
+    assert devices[0]
+    assert devices[0].name == device_id
+    assert devices[1] is devices[0]
+    assert devices[2] is devices[0]
+
 
 async def test_get_devices(
     device_handler: DeviceHandler,
@@ -58,6 +136,72 @@ async def test_get_devices(
     assert devices[1].type == "sdm.devices.types.device-type2"
 
 
+async def test_invalidate_during_device_lookup(
+    app: aiohttp.web.Application,
+    cached_api_client: Callable[[], Awaitable[google_nest_api.GoogleNestAPI]],
+) -> None:
+    device_id = f"enterprises/{PROJECT_ID}/devices/device-id1"
+    started = asyncio.Event()
+    release = asyncio.Event()
+    reads = 0
+
+    async def handler(request: aiohttp.web.Request) -> aiohttp.web.Response:
+        nonlocal reads
+        reads += 1
+        read = reads
+        if read == 1:
+            started.set()
+            await release.wait()
+        return aiohttp.web.json_response(
+            {"name": device_id, "type": f"sdm.devices.types.read-{read}"}
+        )
+
+    app.router.add_get(f"/{device_id}", handler)
+
+    api = await cached_api_client()
+    lookup = asyncio.create_task(api.async_get_device("device-id1"))
+    await started.wait()
+
+    # Invalidating while a request is in flight sends a new request
+    api.invalidate("device-id1")
+    device = await api.async_get_device("device-id1")
+    assert device
+    assert device.type == "sdm.devices.types.read-2"
+
+    # The stale response is returned to its caller but is not cached
+    release.set()
+    stale_device = await lookup
+    assert stale_device
+    assert stale_device.type == "sdm.devices.types.read-1"
+
+    device = await api.async_get_device("device-id1")
+    assert device
+    assert device.type == "sdm.devices.types.read-2"
+    assert reads == 2
+
+
+async def test_get_device_after_get_devices(
+    app: aiohttp.web.Application,
+    recorder: Recorder,
+    cached_api_client: Callable[[], Awaitable[google_nest_api.GoogleNestAPI]],
+) -> None:
+    device_id = f"enterprises/{PROJECT_ID}/devices/device-id1"
+    reply_handler(
+        app,
+        f"/enterprises/{PROJECT_ID}/devices",
+        recorder,
+        [{"devices": [{"name": device_id, "type": "sdm.devices.types.device-type"}]}],
+    )
+
+    api = await cached_api_client()
+    devices = await api.async_get_devices()
+    assert len(devices) == 1
+
+    # No lookup handler is registered so this is served from the list response
+    device = await api.async_get_device("device-id1")
+    assert device is devices[0]
+
+
 async def test_fan_set_timer(
     app: aiohttp.web.Application,
     recorder: Recorder,
@@ -111,6 +255,22 @@ async def test_get_structure(
     assert "sdm.structures.traits.Info" in structure.traits
 
 
+async def test_get_structure_cached(
+    app: aiohttp.web.Application,
+    structure_handler: StructureHandler,
+    cached_api_client: Callable[[], Awaitable[google_nest_api.GoogleNestAPI]],
+) -> None:
+    structure_id = structure_handler.add_structure()
+
+    api = await cached_api_client()
+    structure = await api.async_get_structure(structure_id.split("/")[-1])
+    assert structure
+    assert structure.name == structure_id
+
+    cached_structure = await api.async_get_structure(structure_id.split("/")[-1])
+    assert cached_structure is structure
+
+
 async def test_get_structures(
     app: aiohttp.web.Application,
     structure_handler: StructureHandler,
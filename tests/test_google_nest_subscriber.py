@@ -12,6 +12,7 @@ import pytest
 from google_nest_sdm import diagnostics
 from google_nest_sdm.auth import AbstractAuth
 from google_nest_sdm.event import EventMessage
+from google_nest_sdm.event_media import InMemoryEventMediaStore
 from google_nest_sdm.exceptions import (
     ConfigurationException,
 )
@@ -19,7 +20,11 @@ from google_nest_sdm.google_nest_subscriber import (
     GoogleNestSubscriber,
     get_api_env,
 )
-from google_nest_sdm.streaming_manager import Message, StreamingManager
+from google_nest_sdm.streaming_manager import (
+    Message,
+    StreamingManager,
+    encode_pubsub_message,
+)
 
 from .conftest import DeviceHandler, EventCallback, StructureHandler, assert_diagnostics
 
@@ -73,6 +78,30 @@ async def test_subscribe_no_events(
     assert devices[device_id2].type == "sdm.devices.types.device-type2"
 
 
+async def test_message_before_device_manager(
+    device_handler: DeviceHandler,
+    structure_handler: StructureHandler,
+    subscriber_client: Callable[[], Awaitable[GoogleNestSubscriber]],
+    streaming_manager: Mock,
+) -> None:
+    subscriber = await subscriber_client()
+    unsub = await subscriber.start_async()
+
+    # Messages are dropped without being parsed until devices are loaded
+    await streaming_manager.callback(Message.from_data({"invalid": "event"}))
+    unsub()
+
+    assert_diagnostics(
+        diagnostics.get_diagnostics(),
+        {
+            "subscriber": {
+                "message_dropped": 1,
+                "start": 1,
+            },
+        },
+    )
+
+
 async def test_subscribe_update_trait(
     app: aiohttp.web.Application,
     device_handler: DeviceHandler,
@@ -145,6 +174,45 @@ async def test_subscribe_update_trait(
     )
 
 
+class SlowEventMediaStore(InMemoryEventMediaStore):
+    """An EventMediaStore where media writes block until released."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def async_save_media(self, media_key: str, content: bytes) -> None:
+        await self.release.wait()
+        await super().async_save_media(media_key, content)
+
+
+async def test_stop_waits_for_media_writes(
+    device_handler: DeviceHandler,
+    structure_handler: StructureHandler,
+    subscriber_client: Callable[[], Awaitable[GoogleNestSubscriber]],
+    streaming_manager: Mock,
+) -> None:
+    device_id = device_handler.add_device()
+    structure_handler.add_structure()
+
+    subscriber = await subscriber_client()
+    store = SlowEventMediaStore()
+    subscriber.cache_policy.store = store
+    await subscriber.start_async()
+    device_manager = await subscriber.async_get_device_manager()
+    device = device_manager.devices[device_id]
+    await device.event_media_manager._async_save_media("media-key", b"image-bytes")
+
+    stop = asyncio.create_task(subscriber.stop_async())
+    await asyncio.sleep(0)
+    streaming_manager.stop.assert_called_once()
+    assert not stop.done()
+
+    store.release.set()
+    await stop
+    assert await store.async_load_media("media-key") == b"image-bytes"
+
+
 async def test_subscribe_device_manager_init(
     app: aiohttp.web.Application,
     device_handler: DeviceHandler,
@@ -167,18 +235,27 @@ async def test_subscribe_device_manager_init(
     unsub()
 
 
+@pytest.mark.parametrize(
+    "subscriber_id",
+    [
+        "bad-subscriber-id",
+        "projects/some-project-id/subscriptions/",
+        "projects/some-project-id/subscriptions/subscriber-id1/extra",
+    ],
+)
 async def test_subscriber_id_error(
     app: aiohttp.web.Application,
     device_handler: DeviceHandler,
     structure_handler: StructureHandler,
     auth_client: Callable[[], Awaitable[AbstractAuth]],
+    subscriber_id: str,
 ) -> None:
     auth = await auth_client()
 
     subscriber = GoogleNestSubscriber(
         auth,
         PROJECT_ID,
-        "bad-subscriber-id",
+        subscriber_id,
     )
     with pytest.raises(ConfigurationException):
         await subscriber.start_async()
@@ -452,6 +529,54 @@ async def test_message_ack_timeout(
     unsub()
 
 
+async def test_message_callback_raises_timeout(
+    auth_client: Callable[[], Awaitable[AbstractAuth]],
+    device_handler: DeviceHandler,
+    structure_handler: StructureHandler,
+    streaming_manager: Mock,
+    subscriber_client: Callable[[], Awaitable[GoogleNestSubscriber]],
+) -> None:
+    """Test a timeout raised by a callback is not reported as an ack timeout."""
+
+    device_id = device_handler.add_device()
+    structure_id = structure_handler.add_structure()
+
+    subscriber = await subscriber_client()
+    unsub = await subscriber.start_async()
+    await subscriber.async_get_device_manager()
+
+    async def async_handle_event(_: Any) -> None:
+        raise TimeoutError("Connection timeout")
+
+    subscriber.set_update_callback(async_handle_event)
+    event = {
+        "eventId": "0120ecc7-3b57-4eb4-9941-91609f189fb4",
+        "timestamp": "2019-01-01T00:00:01Z",
+        "relationUpdate": {
+            "type": "CREATED",
+            "subject": structure_id,
+            "object": device_id,
+        },
+        "userId": "AVPHwEuBfnPOnTqzVFT4IONX2Qqhu9EJ4ubO-bNnQ-yi",
+    }
+    with pytest.raises(TimeoutError, match="Connection timeout"):
+        await streaming_manager.callback(Message.from_data(event))
+
+    # The streaming manager also reports it as an error rather than a timeout
+    manager = StreamingManager(
+        await auth_client(), SUBSCRIPTION_NAME, streaming_manager.callback
+    )
+    assert not await manager._process_message(encode_pubsub_message(event))
+
+    unsub()
+
+    diag = diagnostics.get_diagnostics()
+    assert diag["subscriber"]["message_callback_timeout"] == 2
+    assert "message_ack_timeout" not in diag["subscriber"]
+    assert diag["streaming_manager"]["process_message_exception"] == 1
+    assert "process_message_timeout" not in diag["streaming_manager"]
+
+
 async def test_refresh_hack_on_invalid_thermostat_traits(
     app: aiohttp.web.Application,
     device_handler: DeviceHandler,
@@ -140,6 +140,7 @@ def mock_subscriber_async_client(
         mock_pull.side_effect = pull_result
         mock.return_value.streaming_pull = mock_pull
         mock.return_value.acknowledge = AsyncMock()
+        mock.return_value.transport.close = AsyncMock()
         yield mock
 
 
@@ -178,6 +179,7 @@ def mock_streaming_manager_factory(
 async def test_subscribe_no_events(
     device_handler: DeviceHandler,
     factory: Callable[[], Awaitable[StreamingManager]],
+    subscriber_async_client: Mock,
 ) -> None:
     streaming_manager = await factory()
     await streaming_manager.start()
@@ -185,6 +187,10 @@ async def test_subscribe_no_events(
     streaming_manager.stop()
     assert object_is(streaming_manager.healthy, False)
 
+    # Stopping also closes the client channel
+    await asyncio.sleep(0)
+    subscriber_async_client.return_value.transport.close.assert_awaited_once()
+
 
 async def test_events_received_at_start(
     device_handler: DeviceHandler,
@@ -233,6 +239,42 @@ async def test_events_received_after_start(
     assert not streaming_manager.pending_ack_ids()
 
 
+@pytest.mark.parametrize(
+    ("ack_error", "expected_pending"),
+    [
+        (None, []),
+        (
+            GoogleAPIError("Error"),  # type: ignore[no-untyped-call]
+            ["ack-0", "ack-1"],
+        ),
+    ],
+)
+async def test_ack_batch_flushed(
+    device_handler: DeviceHandler,
+    factory: Callable[[], Awaitable[StreamingManager]],
+    subscriber_async_client: Mock,
+    message_queue: MessageQueue,
+    messages_received: list[Message],
+    ack_error: Exception | None,
+    expected_pending: list[str],
+) -> None:
+    subscriber_async_client.return_value.acknowledge.side_effect = ack_error
+    with patch("google_nest_sdm.streaming_manager.ACK_BATCH_SIZE", 2):
+        streaming_manager = await factory()
+        await streaming_manager.start()
+
+        await message_queue.async_push_events([{"eventId": "1"}, {"eventId": "2"}])
+        await asyncio.sleep(0)
+
+    assert len(messages_received) == 2
+    subscriber_async_client.return_value.acknowledge.assert_awaited_once_with(
+        subscription=SUBSCRIPTION_NAME,
+        ack_ids=["ack-0", "ack-1"],
+    )
+    assert streaming_manager.pending_ack_ids() == expected_pending
+    streaming_manager.stop()
+
+
 async def test_cancel_after_message_received(
     device_handler: DeviceHandler,
     factory: Callable[[], Awaitable[StreamingManager]],
@@ -335,7 +377,8 @@ async def test_run_loop_exception(
     ("callback_exception", "metrics"),
     [
         (AuthException(), {"process_message_exception": 1}),
-        (TimeoutError(), {"process_message_timeout": 1}),
+        # A timeout raised by the callback is not the ack deadline
+        (TimeoutError(), {"process_message_exception": 1}),
     ],
 )
 async def test_callback_exception(
@@ -369,6 +412,41 @@ async def test_callback_exception(
     streaming_manager.stop()
 
 
+async def test_callback_ack_deadline(
+    device_handler: DeviceHandler,
+    subscriber_async_client: Mock,
+    auth_client: Callable[[], Awaitable[AbstractAuth]],
+    message_queue: MessageQueue,
+) -> None:
+    auth = await auth_client()
+
+    async def callback(message: Message) -> None:
+        await asyncio.Event().wait()
+
+    streaming_manager = StreamingManager(auth, SUBSCRIPTION_NAME, callback)
+    await message_queue.async_push_events([{"eventId": "1"}])
+
+    with patch("google_nest_sdm.streaming_manager.MESSAGE_ACK_TIMEOUT_SECONDS", 0):
+        await streaming_manager.start()
+        await asyncio.sleep(0.01)  # yield to background task
+
+    assert_diagnostics(
+        diagnostics.get_diagnostics(),
+        {
+            "streaming_manager": {
+                "connect": 1,
+                "run": 1,
+                "start": 1,
+                "process_message": 1,
+                "process_message_timeout": 1,
+            }
+        },
+    )
+    assert not streaming_manager.pending_ack_ids()
+
+    streaming_manager.stop()
+
+
 @pytest.mark.parametrize(
     ("pull_exception"),
     [
@@ -453,6 +531,124 @@ async def test_reconnect_exception(
     assert messages_received[1].payload == {"eventId": "2"}
 
 
+@pytest.mark.parametrize(
+    ("pull_exception"),
+    [
+        (
+            [
+                None,
+                GoogleAPIError("Error"),
+                GoogleAPIError("Error"),
+                GoogleAPIError("Error"),
+                None,
+            ]
+        ),
+    ],
+)
+async def test_reconnect_backoff_jitter(
+    factory: Callable[[], Awaitable[StreamingManager]],
+    message_queue: MessageQueue,
+) -> None:
+    streaming_manager = await factory()
+    await streaming_manager.start()
+    streaming_manager._backoff = datetime.timedelta(seconds=10)
+
+    real_sleep = asyncio.sleep
+    delays: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        if delay:
+            delays.append(delay)
+        await real_sleep(0)
+
+    with patch(
+        "google_nest_sdm.streaming_manager.MAX_BACKOFF_INTERVAL",
+        datetime.timedelta(seconds=20),
+    ), patch(
+        "google_nest_sdm.streaming_manager.random.uniform",
+        side_effect=lambda low, high: high / 2,
+    ) as mock_uniform, patch(
+        "google_nest_sdm.streaming_manager.asyncio.sleep", fake_sleep
+    ):
+        await message_queue.async_push_errors([SubscriberException("Error")])
+        for _ in range(20):
+            await real_sleep(0)  # yield to each reconnect attempt
+
+    # The ceiling grows by BACKOFF_MULTIPLIER up to MAX_BACKOFF_INTERVAL and
+    # each attempt sleeps for a random time below it
+    assert [call.args for call in mock_uniform.call_args_list] == [
+        (0, 10.0),
+        (0, 15.0),
+        (0, 20.0),
+        (0, 20.0),
+    ]
+    assert delays == [5.0, 7.5, 10.0, 10.0]
+    assert_diagnostics(
+        diagnostics.get_diagnostics(),
+        {
+            "streaming_manager": {
+                "backoff": 3,
+                "connect": 5,
+                "exception": 1,
+                "run": 1,
+                "start": 1,
+            },
+            "subscriber": {
+                "streaming_iterator.api_error": 1,
+                "streaming_pull.api_error": 3,
+            },
+        },
+    )
+    assert object_is(streaming_manager.healthy, True)
+
+    streaming_manager.stop()
+
+
+@pytest.mark.parametrize(
+    ("reset_interval", "expected_connects"),
+    [
+        (datetime.timedelta(seconds=0), 2),
+        (datetime.timedelta(hours=1), 1),
+    ],
+)
+async def test_backoff_reset_after_stable_connection(
+    factory: Callable[[], Awaitable[StreamingManager]],
+    message_queue: MessageQueue,
+    reset_interval: datetime.timedelta,
+    expected_connects: int,
+) -> None:
+    streaming_manager = await factory()
+
+    await streaming_manager.start()
+    # Simulate a backoff left over from earlier failed reconnects
+    streaming_manager._backoff = datetime.timedelta(minutes=10)
+
+    with patch(
+        "google_nest_sdm.streaming_manager.BACKOFF_RESET_INTERVAL", reset_interval
+    ):
+        await message_queue.async_push_errors([SubscriberException("Error")])
+        await asyncio.sleep(0)  # yield to sleep on retry
+
+    # A connection that stayed up long enough reconnects right away, otherwise
+    # it is still waiting out the previous backoff
+    assert_diagnostics(
+        diagnostics.get_diagnostics(),
+        {
+            "streaming_manager": {
+                "connect": expected_connects,
+                "exception": 1,
+                "run": 1,
+                "start": 1,
+            },
+            "subscriber": {
+                "streaming_iterator.api_error": 1,
+            },
+        },
+    )
+
+    streaming_manager.stop()
+
+
 async def test_uncaught_streaming_pull_exception(
     factory: Callable[[], Awaitable[StreamingManager]],
     message_queue: MessageQueue,
@@ -87,6 +87,66 @@ async def test_streaming_pull() -> None:
     mock_streaming_pull.assert_awaited_once()
 
 
+async def test_close() -> None:
+    """Test closing the client closes the Pub/Sub channel once."""
+
+    client = SubscriberClient(auth=AsyncMock(), subscription_name="test")
+    # Closing before any call is a no-op
+    await client.close()
+
+    with patch(
+        "google_nest_sdm.subscriber_client.pubsub_v1.SubscriberAsyncClient"
+    ) as mock_client:
+        mock_client.return_value.acknowledge = AsyncMock()
+        mock_close = AsyncMock()
+        mock_client.return_value.transport.close = mock_close
+        await client.ack_messages(["message1"])
+        await client.close()
+        await client.close()
+
+    mock_close.assert_awaited_once()
+
+
+async def test_close_client_replaced_after_creds_expired() -> None:
+    """Test a client replaced after creds expire is closed on the next pull."""
+
+    creds1 = Mock(expired=False)
+    creds2 = Mock(expired=False)
+    auth = AsyncMock()
+    auth.async_get_creds.side_effect = [creds1, creds2]
+    client = SubscriberClient(auth=auth, subscription_name="test")
+
+    pubsub_client1 = Mock()
+    pubsub_client1.streaming_pull = AsyncMock()
+    pubsub_client1.transport.close = AsyncMock()
+    pubsub_client2 = Mock()
+    pubsub_client2.acknowledge = AsyncMock()
+    pubsub_client2.streaming_pull = AsyncMock()
+    pubsub_client2.transport.close = AsyncMock()
+    with patch(
+        "google_nest_sdm.subscriber_client.pubsub_v1.SubscriberAsyncClient",
+        side_effect=[pubsub_client1, pubsub_client2],
+    ):
+        await client.streaming_pull(lambda: [])
+
+        # The stream may still be using the old client when it is replaced
+        creds1.expired = True
+        await client.ack_messages(["message1"])
+        pubsub_client2.acknowledge.assert_awaited_once()
+        pubsub_client1.transport.close.assert_not_awaited()
+
+        # Reconnecting moves the stream to the new client
+        await client.streaming_pull(lambda: [])
+        pubsub_client2.streaming_pull.assert_awaited_once()
+        pubsub_client1.transport.close.assert_awaited_once()
+        pubsub_client2.transport.close.assert_not_awaited()
+
+        await client.close()
+
+    pubsub_client1.transport.close.assert_awaited_once()
+    pubsub_client2.transport.close.assert_awaited_once()
+
+
 @pytest.mark.parametrize(
     ("raised", "expected", "message"),
     [
@@ -144,6 +204,8 @@ async def test_request_generator() -> None:
         request = await anext(stream_iter)
         assert request.subscription == "projects/some-project-id/subscriptions/sub-1"
         assert request.stream_ack_deadline_seconds == 180
+        assert request.max_outstanding_messages == 1000
+        assert request.max_outstanding_bytes == 100 * 1024 * 1024
         assert not request.ack_ids
 
         request = await anext(stream_iter)